@@ -0,0 +1,827 @@
+"""Metric collectors for Monix.
+
+Every metric source is a small ``Collector`` that declares the snapshot fields it
+produces, a rough cost, how often it should run and how long a single call may take.
+``CollectorManager`` runs them on a shared worker pool, enforces the per-call timeout
+and trips a circuit breaker on repeated failures, so one broken or slow source
+(battery, sensors, NVML, a network drive) never takes the whole tick down.
+
+Third-party collectors are discovered through the ``monix.collectors`` entry point
+group. Each entry point must resolve to a ``Collector`` subclass, or any zero-argument
+callable returning a ``Collector`` instance.
+"""
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+try:
+    from py3nvml import py3nvml as nvml  # type: ignore
+except Exception:  # pragma: no cover
+    nvml = None  # type: ignore
+
+ENTRY_POINT_GROUP = "monix.collectors"
+
+# Circuit breaker defaults
+FAILURE_THRESHOLD = 3  # consecutive failures before the breaker opens
+BREAKER_COOLDOWN = 5.0  # seconds; doubled on every re-open
+BREAKER_MAX_COOLDOWN = 120.0
+TICK_BUDGET = 0.25  # max seconds the UI thread waits for in-flight collectors per tick
+MAX_ABANDONED = 4  # timed-out calls that get a replacement worker; further hung collectors are disabled
+
+
+class CollectorUnavailable(Exception):
+    """Raised by a collector whose source does not exist on this machine.
+
+    Unlike ordinary failures this disables the collector for the session instead of
+    reporting it as failing (e.g. NVML on a machine without an NVIDIA GPU).
+    """
+
+
+class Collector:
+    """Base class for a metric source.
+
+    Subclasses set the class attributes and implement ``collect``, returning a dict
+    whose keys are a subset of ``fields``. Missing keys simply mean "no reading".
+    A collector is never called concurrently with itself, so it may keep state
+    (previous counters, device handles) on ``self``.
+    """
+    name: str = ""
+    fields: Tuple[str, ...] = ()
+    cost: float = 0.001  # estimated seconds per call; expensive collectors are submitted first
+    interval: float = 1.0  # seconds between runs
+    timeout: float = 1.0  # seconds a single call may take before it counts as failed
+    shared_fields: Optional[Tuple[str, ...]] = None  # numeric fields published to shared memory; None = all
+
+    def published_fields(self) -> Tuple[str, ...]:
+        return self.fields if self.shared_fields is None else self.shared_fields
+
+    def collect(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the collector."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with exponential cooldown.
+
+    After ``threshold`` consecutive failures the breaker opens for ``cooldown`` seconds.
+    Once the cooldown expires one trial call is allowed; another failure re-opens it
+    with a doubled cooldown, a success closes it and resets the cooldown.
+    """
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, cooldown: float = BREAKER_COOLDOWN,
+                 max_cooldown: float = BREAKER_MAX_COOLDOWN):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self._cooldown = cooldown
+
+    def allow(self, now: float) -> bool:
+        return now >= self.open_until
+
+    def is_open(self, now: float) -> bool:
+        return now < self.open_until
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.open_until = 0.0
+        self._cooldown = self.base_cooldown
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.open_until = now + self._cooldown
+            self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+
+
+@dataclass
+class Snapshot:
+    """Merged result of the latest successful run of every collector."""
+    values: Dict[str, Any] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)  # collector name -> last error
+    timestamp: float = 0.0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.failed)
+
+
+class _Slot:
+    """Scheduling state of one collector inside the manager."""
+
+    def __init__(self, collector: Collector):
+        self.collector = collector
+        self.breaker = CircuitBreaker()
+        self.future: Optional[Future] = None
+        self.started = 0.0
+        self.next_due = 0.0
+        self.timed_out = False
+        self.disabled = False
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+
+class _DaemonPool:
+    """Minimal thread pool whose workers are daemon threads.
+
+    ``concurrent.futures.ThreadPoolExecutor`` joins its workers at interpreter exit, so
+    a single ``collect()`` stuck on a hung network drive would keep Monix alive after
+    quitting. These workers are never joined. A call given up on via ``abandon`` gets a
+    replacement worker (up to ``max_abandoned`` at once) so the pool keeps its capacity;
+    the abandoned worker exits when its call eventually returns.
+    """
+
+    def __init__(self, size: int, max_abandoned: int = MAX_ABANDONED, name: str = "monix-collector"):
+        self._size = size
+        self._max_abandoned = max_abandoned
+        self._name = name
+        self._queue: "queue.SimpleQueue[Optional[Tuple[Future, Callable[[], Any]]]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._abandoned: set = set()
+        self._threads = 0
+        for _ in range(size):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        self._threads += 1
+        threading.Thread(target=self._worker, name=f"{self._name}-{self._threads}", daemon=True).start()
+
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        fut: Future = Future()
+        self._queue.put((fut, fn))
+        return fut
+
+    def abandon(self, fut: Future) -> bool:
+        """Stop waiting for a running call. Returns False once the abandoned cap is reached."""
+        with self._lock:
+            if fut.done():
+                return True
+            if len(self._abandoned) >= self._max_abandoned:
+                return False
+            self._abandoned.add(fut)
+            self._spawn()
+            return True
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            fut, fn = item
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(fn())
+            except BaseException as e:
+                fut.set_exception(e)
+            with self._lock:
+                if fut in self._abandoned:  # a replacement already took this worker's place
+                    self._abandoned.discard(fut)
+                    self._threads -= 1
+                    return
+
+    def shutdown(self) -> None:
+        """Cancel queued calls and tell idle workers to exit, without waiting for running ones."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _ in range(self._threads):
+            self._queue.put(None)
+
+
+class CollectorManager:
+    """Runs collectors on a shared thread pool and merges their results.
+
+    ``poll`` is called from the UI thread once per tick. It submits every collector
+    that is due (and whose breaker allows it), waits at most ``tick_budget`` seconds
+    for in-flight calls, and returns a ``Snapshot``. Calls still running are harvested
+    on a later tick, or counted as failures once they exceed the collector's timeout.
+    A thread pool is used rather than a process pool because collectors keep
+    process-local state such as NVML handles and previous I/O counters; its daemon
+    workers never block exit, even when a call hangs.
+    """
+
+    def __init__(self, collectors: Iterable[Collector], max_workers: Optional[int] = None,
+                 tick_budget: float = TICK_BUDGET):
+        self._slots: List[_Slot] = [_Slot(c) for c in collectors]
+        if max_workers is None:
+            max_workers = min(8, len(self._slots) + 2)
+        self._pool = _DaemonPool(max(1, max_workers))
+        self.tick_budget = tick_budget
+
+    @property
+    def collectors(self) -> List[Collector]:
+        return [s.collector for s in self._slots]
+
+    @property
+    def shared_fields(self) -> List[str]:
+        return [f for s in self._slots for f in s.collector.published_fields()]
+
+    def poll(self) -> Snapshot:
+        now = time.monotonic()
+        due = [s for s in self._slots
+               if not s.disabled and s.future is None and now >= s.next_due and s.breaker.allow(now)]
+        for slot in sorted(due, key=lambda s: -s.collector.cost):
+            slot.started = now
+            slot.next_due = now + slot.collector.interval
+            slot.timed_out = False
+            slot.future = self._pool.submit(slot.collector.collect)
+        pending = [s.future for s in self._slots if s.future is not None and not s.timed_out]
+        if pending:
+            wait(pending, timeout=self.tick_budget)
+        now = time.monotonic()
+        for slot in self._slots:
+            self._harvest(slot, now)
+        return self.snapshot()
+
+    def _harvest(self, slot: _Slot, now: float) -> None:
+        fut = slot.future
+        if fut is None:
+            return
+        if not fut.done():
+            if not slot.timed_out and now - slot.started > slot.collector.timeout:
+                # The call cannot be interrupted; keep the future so the collector is
+                # not re-entered, but drop its fields and count the failure now.
+                slot.timed_out = True
+                self._fail(slot, now, f"timed out after {slot.collector.timeout:g}s")
+                if not self._pool.abandon(fut):
+                    # Too many hung calls already pin workers; stop scheduling this one
+                    slot.disabled = True
+                    slot.error = "hung, disabled"
+            return
+        slot.future = None
+        if slot.timed_out:
+            return  # late result of an abandoned call
+        try:
+            values = fut.result()
+        except CollectorUnavailable as e:
+            slot.disabled = True
+            slot.result = None
+            slot.error = None
+            print(f"Collector '{slot.collector.name}' unavailable: {e}")
+            return
+        except Exception as e:
+            self._fail(slot, now, str(e) or type(e).__name__)
+            return
+        declared = slot.collector.fields
+        slot.result = {k: v for k, v in (values or {}).items() if k in declared}
+        slot.error = None
+        slot.breaker.record_success()
+
+    def _fail(self, slot: _Slot, now: float, error: str) -> None:
+        slot.result = None
+        slot.error = error
+        slot.breaker.record_failure(now)
+
+    def snapshot(self) -> Snapshot:
+        snap = Snapshot(timestamp=time.time())
+        for slot in self._slots:
+            if slot.result:
+                snap.values.update(slot.result)
+            if slot.error is not None:
+                snap.failed[slot.collector.name] = slot.error
+        return snap
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+        for slot in self._slots:
+            if slot.future is not None and not slot.future.done():
+                continue  # still inside collect(); closing now would race with it
+            try:
+                slot.collector.close()
+            except Exception:
+                pass
+
+
+# ---------------- Built-in Collectors ---------------- #
+
+class CpuMemCollector(Collector):
+    name = "cpu_mem"
+    fields = ("cpu_percent", "mem_percent", "mem_used", "mem_total", "mem_available",
+              "swap_percent", "swap_used", "swap_total")
+
+    def __init__(self):
+        psutil.cpu_percent(interval=None)  # prime the counter; first reading is meaningless
+
+    def collect(self) -> Dict[str, Any]:
+        mem = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        return {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "mem_percent": mem.percent,
+            "mem_used": mem.used,
+            "mem_total": mem.total,
+            "mem_available": mem.available,
+            "swap_percent": swap.percent,
+            "swap_used": swap.used,
+            "swap_total": swap.total,
+        }
+
+
+class GpuCollector(Collector):
+    """NVIDIA GPU load, temperature and VRAM via a persistent NVML handle."""
+    name = "gpu"
+    fields = ("gpu_util", "gpu_temp", "vram_used", "vram_total")
+    cost = 0.01
+
+    def __init__(self):
+        self._handle = None
+
+    def collect(self) -> Dict[str, Any]:
+        if nvml is None:
+            raise CollectorUnavailable("py3nvml is not installed")
+        if self._handle is None:
+            try:
+                nvml.nvmlInit()
+                self._handle = nvml.nvmlDeviceGetHandleByIndex(0)
+            except Exception as e:
+                raise CollectorUnavailable(f"NVML init failed: {e}")
+        handle = self._handle
+        util_obj = nvml.nvmlDeviceGetUtilizationRates(handle)
+        mem = nvml.nvmlDeviceGetMemoryInfo(handle)
+        values: Dict[str, Any] = {
+            "gpu_util": float(getattr(util_obj, 'gpu', 0.0) if util_obj else 0.0),
+            "gpu_temp": float(nvml.nvmlDeviceGetTemperature(handle, nvml.NVML_TEMPERATURE_GPU)),
+        }
+        if mem:
+            values["vram_used"] = int(getattr(mem, 'used', 0))
+            values["vram_total"] = int(getattr(mem, 'total', 0))
+        return values
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle = None
+            nvml.nvmlShutdown()
+
+
+class TemperatureCollector(Collector):
+    name = "temps"
+    fields = ("cpu_temp",)
+    cost = 0.02
+    interval = 2.0
+
+    def collect(self) -> Dict[str, Any]:
+        temps_func = getattr(psutil, 'sensors_temperatures', None)
+        if not callable(temps_func):
+            raise CollectorUnavailable("psutil has no sensors_temperatures on this platform")
+        temps_raw = temps_func()
+        if isinstance(temps_raw, dict):
+            # Find first with any reading
+            for sensor_list in temps_raw.values():
+                if sensor_list:
+                    cand = getattr(sensor_list[0], 'current', None)
+                    if cand is not None:
+                        return {"cpu_temp": float(cand)}
+        return {}
+
+
+class _RateCollector(Collector):
+    """Helper for collectors that turn monotonically increasing counters into rates."""
+
+    def __init__(self):
+        self._prev: Any = None
+        self._prev_time = 0.0
+
+    def _elapsed(self) -> float:
+        now = time.monotonic()
+        dt = max(0.001, now - self._prev_time)
+        self._prev_time = now
+        return dt
+
+
+class NetworkCollector(_RateCollector):
+    name = "network"
+    fields = ("net_down_bps", "net_up_bps")
+
+    def collect(self) -> Dict[str, Any]:
+        net_now = psutil.net_io_counters()
+        dt = self._elapsed()
+        prev, self._prev = self._prev, net_now
+        if prev is None:
+            return {}
+        return {
+            "net_down_bps": max(0, net_now.bytes_recv - prev.bytes_recv) / dt,
+            "net_up_bps": max(0, net_now.bytes_sent - prev.bytes_sent) / dt,
+        }
+
+
+class DiskIOCollector(_RateCollector):
+    name = "disk_io"
+    fields = ("disk_read_bps", "disk_write_bps")
+
+    def collect(self) -> Dict[str, Any]:
+        disk_io_now = psutil.disk_io_counters(perdisk=True) or {}
+        dt = self._elapsed()
+        prev_all, self._prev = self._prev, disk_io_now
+        if prev_all is None:
+            return {}
+        reads = writes = 0.0
+        for name, stats in disk_io_now.items():
+            prev = prev_all.get(name)
+            if prev:
+                reads += max(0, stats.read_bytes - prev.read_bytes)
+                writes += max(0, stats.write_bytes - prev.write_bytes)
+        return {"disk_read_bps": reads / dt, "disk_write_bps": writes / dt}
+
+
+class DiskUsageCollector(Collector):
+    """Usage of every mounted disk as a list of (display, percent, used, total)."""
+    name = "disk_usage"
+    fields = ("disks",)
+    shared_fields = ()  # list of tuples, not representable in the fixed-layout segment
+    cost = 0.05
+    interval = 2.0
+    timeout = 2.0
+
+    def collect(self) -> Dict[str, Any]:
+        disks: List[Tuple[str, float, int, int]] = []
+        parts = [p for p in psutil.disk_partitions(all=False) if p.fstype and ('cdrom' not in p.opts.lower())]
+        for p in parts:
+            letter = (p.device or p.mountpoint)
+            if os.name == 'nt' and len(letter) >= 2 and letter[1] == ':':
+                display = letter[:2]
+            else:
+                display = p.mountpoint
+            try:
+                usage = psutil.disk_usage(p.mountpoint)
+            except Exception:
+                continue
+            disks.append((display, usage.percent, usage.used, usage.total))
+        return {"disks": disks}
+
+
+class ProcessCollector(Collector):
+    name = "processes"
+    fields = ("proc_count", "thread_count")
+    cost = 0.2
+    interval = 5.0
+    timeout = 3.0
+
+    def collect(self) -> Dict[str, Any]:
+        proc_count = len(psutil.pids())
+        thread_total = 0
+        for p in psutil.process_iter(['num_threads']):
+            try:
+                thread_total += p.info.get('num_threads', 0) or 0
+            except Exception:
+                pass
+        return {"proc_count": proc_count, "thread_count": thread_total}
+
+
+class BatteryCollector(Collector):
+    name = "battery"
+    fields = ("battery_percent", "battery_plugged", "battery_secsleft")
+    cost = 0.01
+    interval = 5.0
+
+    def collect(self) -> Dict[str, Any]:
+        func = getattr(psutil, 'sensors_battery', None)
+        if not callable(func):
+            raise CollectorUnavailable("psutil has no sensors_battery on this platform")
+        bat = func()
+        if not bat:
+            return {}
+        return {
+            "battery_percent": float(bat.percent),
+            "battery_plugged": bool(getattr(bat, 'power_plugged', False)),
+            "battery_secsleft": getattr(bat, 'secsleft', None),
+        }
+
+
+class UptimeCollector(Collector):
+    name = "uptime"
+    fields = ("boot_time",)
+    interval = 60.0
+
+    def collect(self) -> Dict[str, Any]:
+        return {"boot_time": psutil.boot_time()}
+
+
+# ---------------- cgroup v2 ---------------- #
+
+CGROUP_ENV = "MONIX_CGROUPS"  # comma-separated cgroup paths, e.g. "self,/system.slice/foo.service"
+CGROUP_FIELDS = ("cpu_percent", "cpu_limit", "throttled_percent", "mem_current", "mem_max", "mem_percent",
+                 "io_read_bps", "io_write_bps", "psi_cpu", "psi_cpu_full", "psi_mem", "psi_mem_full",
+                 "psi_io", "psi_io_full")
+
+
+def find_cgroup2_mount() -> Optional[str]:
+    """Return the cgroup2 mount point (``/sys/fs/cgroup`` or ``.../unified`` on hybrid hosts)."""
+    try:
+        with open('/proc/self/mounts') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) > 2 and parts[2] == 'cgroup2':
+                    return parts[1]
+    except OSError:
+        pass
+    return None
+
+
+def own_cgroup_path() -> Optional[str]:
+    """Return this process's cgroup v2 path from ``/proc/self/cgroup`` (the ``0::`` line)."""
+    try:
+        with open('/proc/self/cgroup') as f:
+            for line in f:
+                if line.startswith('0::'):
+                    return line[3:].strip()
+    except OSError:
+        pass
+    return None
+
+
+class CgroupCollector(Collector):
+    """Limit-relative usage, throttling and PSI pressure of one cgroup v2 group.
+
+    Interface files are opened once and re-read with ``seek(0)`` on every run, which
+    regenerates their content without another open/close. Files missing because a
+    controller is not enabled for the group (or PSI is not built in) are skipped.
+    Limits are the tightest ``cpu.max``/``memory.max`` of the group and its ancestors,
+    since they are usually set on a parent slice rather than the leaf.
+    If the group is removed (ENODEV on read), the handles are dropped and reopened on
+    the next run, so a recreated group is picked up again.
+    Fields are prefixed with ``cg<index>_`` so several groups can be watched at once.
+    """
+    cost = 0.002
+
+    _FILES = ("cpu.stat", "cpuset.cpus.effective", "memory.current", "io.stat",
+              "cpu.pressure", "memory.pressure", "io.pressure")
+    _LIMIT_FILES = ("cpu.max", "memory.max")
+
+    def __init__(self, path: str, index: int = 0, mount: Optional[str] = None):
+        self.path = path
+        self.prefix = f"cg{index}_"
+        self.name = f"cgroup:{path}"
+        self.fields = tuple(self.prefix + f for f in CGROUP_FIELDS)
+        self._mount = mount
+        self._opened = False
+        self._files: Optional[Dict[str, Any]] = None
+        self._limit_files: List[Dict[str, Any]] = []  # one dict per directory, leaf first
+        self._prev_cpu: Optional[Tuple[float, int, Optional[int], Optional[int]]] = None  # (time, usage_usec, nr_periods, nr_throttled)
+        self._prev_io: Optional[Tuple[float, int, int]] = None  # (time, rbytes, wbytes)
+
+    def _open(self) -> Dict[str, Any]:
+        if not sys.platform.startswith('linux'):
+            raise CollectorUnavailable("cgroups are Linux only")
+        mount = self._mount or find_cgroup2_mount()
+        if mount is None:
+            raise CollectorUnavailable("no cgroup2 filesystem mounted")
+        path = self.path
+        if path == 'self':
+            path = own_cgroup_path() or '/'
+        rel = path.strip('/')
+        directory = os.path.join(mount, rel)
+        if not os.path.isdir(directory):
+            if self._opened:  # Removed since we last saw it; keep retrying via the breaker
+                raise FileNotFoundError(f"cgroup {path} was removed")
+            raise CollectorUnavailable(f"cgroup {path} not found under {mount}")
+        files = _open_files(directory, self._FILES)
+        # Walk up to and including the mount root: inside a cgroup namespace (e.g. a
+        # container) the root holds the container's own limits
+        parts = rel.split('/') if rel else []
+        self._limit_files = [_open_files(os.path.join(mount, *parts[:i]), self._LIMIT_FILES)
+                             for i in range(len(parts), -1, -1)]
+        self._opened = True
+        return files
+
+    @staticmethod
+    def _read(f: Any) -> Optional[str]:
+        if f is None:
+            return None
+        f.seek(0)
+        return f.read().decode('ascii', 'replace')
+
+    def collect(self) -> Dict[str, Any]:
+        if self._files is None:
+            self._files = self._open()
+        try:
+            return self._collect()
+        except OSError:
+            self.close()  # ENODEV after the group was removed: reopen on the next run
+            raise
+
+    def _collect(self) -> Dict[str, Any]:
+        files = self._files or {}
+        now = time.monotonic()
+        p = self.prefix
+        values: Dict[str, Any] = {}
+        # CPU: usage relative to the effective quota (or the usable CPUs when unlimited)
+        limit = self._cpu_limit()
+        values[p + "cpu_limit"] = limit
+        text = self._read(files.get("cpu.stat"))
+        if text is not None:
+            stat = _parse_flat_keyed(text)
+            # nr_periods/nr_throttled only exist when the cpu controller is enabled
+            cur = (now, stat.get("usage_usec", 0), stat.get("nr_periods"), stat.get("nr_throttled"))
+            prev, self._prev_cpu = self._prev_cpu, cur
+            if prev is not None:
+                dt = max(0.001, cur[0] - prev[0])
+                values[p + "cpu_percent"] = max(0, cur[1] - prev[1]) / 1e6 / dt / limit * 100
+                if None not in (cur[2], cur[3], prev[2], prev[3]):
+                    periods = cur[2] - prev[2]
+                    values[p + "throttled_percent"] = (cur[3] - prev[3]) / periods * 100 if periods > 0 else 0.0
+        # Memory: memory.max is "max" when unlimited
+        current = self._read(files.get("memory.current"))
+        if current is not None:
+            mem_current = int(current)
+            values[p + "mem_current"] = mem_current
+            mem_max = self._mem_limit()
+            if mem_max is not None:
+                values[p + "mem_max"] = mem_max
+                values[p + "mem_percent"] = mem_current / mem_max * 100 if mem_max else 0.0
+        # IO: io.stat has one "MAJ:MIN rbytes=.. wbytes=.." line per device
+        text = self._read(files.get("io.stat"))
+        if text is not None:
+            rbytes = wbytes = 0
+            for line in text.splitlines():
+                for kv in line.split()[1:]:
+                    k, _, v = kv.partition('=')
+                    if k == 'rbytes':
+                        rbytes += int(v)
+                    elif k == 'wbytes':
+                        wbytes += int(v)
+            prev_io, self._prev_io = self._prev_io, (now, rbytes, wbytes)
+            if prev_io is not None:
+                dt = max(0.001, now - prev_io[0])
+                values[p + "io_read_bps"] = max(0, rbytes - prev_io[1]) / dt
+                values[p + "io_write_bps"] = max(0, wbytes - prev_io[2]) / dt
+        # PSI: share of wall time (avg10, percent) tasks were stalled on the resource.
+        # cpu "full" is only reported for non-root groups on kernels >= 5.13.
+        for res, key in (("cpu", "psi_cpu"), ("memory", "psi_mem"), ("io", "psi_io")):
+            text = self._read(files.get(f"{res}.pressure"))
+            if text is None:
+                continue
+            psi = _parse_pressure(text)
+            if "some" in psi:
+                values[p + key] = psi["some"]
+            if "full" in psi:
+                values[p + key + "_full"] = psi["full"]
+        return values
+
+    def _cpu_limit(self) -> float:
+        limits = []
+        for d in self._limit_files:
+            text = self._read(d.get("cpu.max"))
+            if text:
+                quota, _, period = text.strip().partition(' ')
+                if quota != 'max' and period:
+                    limits.append(int(quota) / int(period))
+        cpus = self._read((self._files or {}).get("cpuset.cpus.effective"))
+        if cpus and cpus.strip():
+            limits.append(float(_count_cpu_list(cpus.strip())))
+        else:
+            limits.append(float(os.cpu_count() or 1))
+        return min(limits)
+
+    def _mem_limit(self) -> Optional[int]:
+        limits = [_parse_max(self._read(d.get("memory.max"))) for d in self._limit_files]
+        known = [m for m in limits if m is not None]
+        return min(known) if known else None
+
+    def close(self) -> None:
+        for files in [self._files or {}] + self._limit_files:
+            for f in files.values():
+                try:
+                    f.close()
+                except OSError:
+                    pass
+        self._files = None
+        self._limit_files = []
+        self._prev_cpu = None
+        self._prev_io = None
+
+
+def _open_files(directory: str, names: Iterable[str]) -> Dict[str, Any]:
+    files: Dict[str, Any] = {}
+    for name in names:
+        try:
+            files[name] = open(os.path.join(directory, name), 'rb', buffering=0)
+        except OSError:
+            pass
+    return files
+
+
+def _parse_flat_keyed(text: str) -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    for line in text.splitlines():
+        k, _, v = line.partition(' ')
+        try:
+            out[k] = int(v)
+        except ValueError:
+            pass
+    return out
+
+
+def _parse_max(text: Optional[str]) -> Optional[int]:
+    if text is None or text.strip() == 'max':
+        return None
+    return int(text)
+
+
+def _parse_pressure(text: str) -> Dict[str, float]:
+    """Parse a PSI file into {"some": avg10, "full": avg10}."""
+    out: Dict[str, float] = {}
+    for line in text.splitlines():
+        kind, *pairs = line.split()
+        for kv in pairs:
+            k, _, v = kv.partition('=')
+            if k == 'avg10':
+                out[kind] = float(v)
+    return out
+
+
+def _count_cpu_list(spec: str) -> int:
+    """Count CPUs in a cpuset list such as ``0-3,8,10-11``."""
+    count = 0
+    for part in spec.split(','):
+        lo, _, hi = part.partition('-')
+        count += (int(hi) - int(lo) + 1) if hi else 1
+    return count
+
+
+def cgroup_collectors(spec: Optional[str] = None) -> List[Collector]:
+    """Build one CgroupCollector per entry of ``spec`` (defaults to ``$MONIX_CGROUPS``).
+
+    Returns an empty list when cgroup mode is not configured.
+    """
+    if spec is None:
+        spec = os.environ.get(CGROUP_ENV, "")
+    paths = [p.strip() for p in spec.split(',') if p.strip()]
+    return [CgroupCollector(path, index=i) for i, path in enumerate(paths)]
+
+
+BUILTIN_COLLECTORS: Tuple[Callable[[], Collector], ...] = (
+    CpuMemCollector,
+    GpuCollector,
+    TemperatureCollector,
+    NetworkCollector,
+    DiskIOCollector,
+    DiskUsageCollector,
+    ProcessCollector,
+    BatteryCollector,
+    UptimeCollector,
+)
+
+
+def default_collectors() -> List[Collector]:
+    return [factory() for factory in BUILTIN_COLLECTORS]
+
+
+def load_plugin_collectors(group: str = ENTRY_POINT_GROUP, reserved: Iterable[str] = ()) -> List[Collector]:
+    """Instantiate third-party collectors registered under the given entry point group.
+
+    Plugins that fail to import or instantiate are skipped with a message, they never
+    prevent Monix from starting. Fields already in ``reserved`` (the built-in ones) or
+    declared by an earlier plugin are dropped from a plugin with a message, so plugins
+    cannot overwrite core values.
+    """
+    taken = set(reserved)
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover
+        return []
+    try:
+        eps = entry_points()
+        selected = eps.select(group=group) if hasattr(eps, 'select') else eps.get(group, [])  # type: ignore[attr-defined]
+    except Exception as e:
+        print(f"Error reading collector plugins: {e}")
+        return []
+    plugins: List[Collector] = []
+    for ep in selected:
+        try:
+            obj = ep.load()
+            collector = obj()
+            if not isinstance(collector, Collector):
+                raise TypeError(f"{ep.value} did not produce a Collector")
+            if not collector.name:
+                collector.name = ep.name
+            clashes = [f for f in collector.fields if f in taken]
+            if clashes:
+                print(f"Collector plugin '{ep.name}': ignoring fields already in use: {', '.join(clashes)}")
+                collector.fields = tuple(f for f in collector.fields if f not in taken)
+                if collector.shared_fields is not None:
+                    collector.shared_fields = tuple(f for f in collector.shared_fields if f not in taken)
+                if not collector.fields:
+                    continue
+            taken.update(collector.fields)
+            plugins.append(collector)
+        except Exception as e:
+            print(f"Error loading collector plugin '{ep.name}': {e}")
+    return plugins
@@ -6,8 +6,9 @@ os.environ["CUDA_DEVICE_ORDER"] = "PCI_BUS_ID"
 
 from startup import ask_startup, is_in_startup, add_to_startup, remove_from_startup
 
-import psutil
-from py3nvml.py3nvml import *  # type: ignore
+from collectors import CollectorManager, Snapshot, cgroup_collectors, default_collectors, load_plugin_collectors
+from sharedmetrics import SharedMetricsWriter
+
 import tkinter as tk
 from tkinter import ttk
 import time
@@ -46,28 +47,8 @@ FONT_TINY = ("Segoe UI", 9)
 SMOOTH_ALPHA = 0.30
 UPDATE_MS = 1000
 RENDER_DELTA_THRESH = 0.4  # percent change required to redraw ring
-
-# NVML persistent handle to reduce init cost
-_NVML_INITIALIZED = False
-_NVML_HANDLE = None
-
-def safe_nvml_get() -> Tuple[float, Optional[float], Optional[Tuple[int,int]]]:
-    """Return (gpu_util%, temperatureC, (vram_used, vram_total)) with persistent NVML handle."""
-    global _NVML_INITIALIZED, _NVML_HANDLE
-    try:
-        if not _NVML_INITIALIZED:
-            nvmlInit()
-            _NVML_HANDLE = nvmlDeviceGetHandleByIndex(0)
-            _NVML_INITIALIZED = True
-        handle = _NVML_HANDLE  # type: ignore
-        util_obj = nvmlDeviceGetUtilizationRates(handle)
-        utilization = float(getattr(util_obj, 'gpu', 0.0) if util_obj else 0.0)
-        temperature = float(nvmlDeviceGetTemperature(handle, NVML_TEMPERATURE_GPU))
-        mem = nvmlDeviceGetMemoryInfo(handle)  # type: ignore[assignment]
-        vram_tuple = (int(getattr(mem, 'used', 0)), int(getattr(mem, 'total', 0))) if mem else None  # type: ignore[attr-defined]
-        return utilization, temperature, vram_tuple
-    except Exception:
-        return 0.0, None, None
+PLUGIN_TEXT_MAX = 90  # characters of plugin fields shown in the System card (about three wrapped lines)
+SHARED_METRICS_RETRY_S = 10.0  # seconds between attempts to (re)create the shared segment
 
 def lerp(a: float, b: float, t: float) -> float:
     return a + (b - a) * t
@@ -96,6 +77,15 @@ def format_bytes(n: float) -> str:
         i += 1
     return f"{n:.1f} {units[i]}"
 
+def format_value(v) -> str:
+    """Compact text for a plugin field value."""
+    if isinstance(v, bool):
+        return 'yes' if v else 'no'
+    if isinstance(v, float):
+        return f"{v:.1f}"
+    text = str(v)
+    return text if len(text) <= 16 else text[:15] + '…'
+
 def format_time(sec: float) -> str:
     sec = int(sec)
     d, r = divmod(sec, 86400)
@@ -182,16 +172,21 @@ class ResourceMonitorApp:
             pass
         style.configure('Dark.Horizontal.TProgressbar', background=ACCENT, troughcolor=TRACK, bordercolor=TRACK, lightcolor=ACCENT, darkcolor=ACCENT)
 
+        self.core_collectors = default_collectors()
+        self.cgroup_collectors = cgroup_collectors()  # Optional, set via MONIX_CGROUPS
+        self.plugin_collectors = load_plugin_collectors(
+            reserved=[f for c in self.core_collectors + self.cgroup_collectors for f in c.fields])
         self._build_ui()
 
         # State
-        self.prev_net = psutil.net_io_counters()
-        self.prev_disk_io = psutil.disk_io_counters(perdisk=True)
-        self.prev_time = time.time()
-        psutil.cpu_percent(interval=None)
+        self.collectors = CollectorManager(self.core_collectors + self.cgroup_collectors + self.plugin_collectors)
+        # Publish snapshots for local consumers; the overlay works fine without it
+        self.shared_metrics: Optional[SharedMetricsWriter] = None
+        self._shared_metrics_error = ''
+        self._shared_metrics_retry_at = 0.0
+        self._start_shared_metrics()
         self.state_ema: Dict[str, float] = {}
         self.update_fail_count = 0
-        self.update_counter = 0
         self.root.after(200, self.update_stats)
 
     # ---------- UI Construction ---------- #
@@ -244,6 +239,9 @@ class ResourceMonitorApp:
         self.gpu_detail_var = tk.StringVar(value='—')
         tk.Label(mem_gpu_card, textvariable=self.mem_detail_var, bg=CARD_BG, fg=MUTED_FG, font=FONT_SMALL, justify='left').pack(anchor='w', padx=12, pady=(0,4))
         tk.Label(mem_gpu_card, textvariable=self.gpu_detail_var, bg=CARD_BG, fg=MUTED_FG, font=FONT_SMALL, justify='left').pack(anchor='w', padx=12, pady=(0,6))
+        self.cgroup_detail_var = tk.StringVar(value='Cgroup: –')
+        if self.cgroup_collectors:  # Limits, throttling & pressure of the first watched cgroup
+            tk.Label(mem_gpu_card, textvariable=self.cgroup_detail_var, bg=CARD_BG, fg=MUTED_FG, font=FONT_SMALL, justify='left').pack(anchor='w', padx=12, pady=(0,6))
 
         # Disk / IO
         disk_card = self._card(lower, 'Disk / IO')
@@ -267,8 +265,12 @@ class ResourceMonitorApp:
         self.uptime_var = tk.StringVar(value='Uptime: –')
         self.proc_summary_var = tk.StringVar(value='Processes: –')
         self.battery_var = tk.StringVar(value='Battery: –')
+        self.plugin_var = tk.StringVar(value='')
         for var in [self.cpu_temp_var, self.gpu_temp_var, self.uptime_var, self.proc_summary_var, self.battery_var]:
             tk.Label(sys_card, textvariable=var, bg=CARD_BG, fg=MUTED_FG, font=FONT_SMALL).pack(anchor='w', padx=12)
+        if self.plugin_collectors:  # Third-party collector fields, wrapped to the card width
+            tk.Label(sys_card, textvariable=self.plugin_var, bg=CARD_BG, fg=MUTED_FG, font=FONT_TINY,
+                     justify='left', wraplength=180).pack(anchor='w', padx=12)
         # Removed right-click hint label
 
         # Arrange lower cards horizontally
@@ -339,11 +341,9 @@ class ResourceMonitorApp:
         self.root.after(50, lambda: self.root.overrideredirect(True))
 
     def quit(self):
-        try:
-            if _NVML_INITIALIZED:
-                nvmlShutdown()
-        except Exception:
-            pass
+        self.collectors.shutdown()
+        if self.shared_metrics is not None:
+            self.shared_metrics.close()
         self.root.destroy()
 
     # ---------- Stats Update ---------- #
@@ -356,118 +356,18 @@ class ResourceMonitorApp:
 
     def update_stats(self):
         try:
-            self.update_counter += 1
-            # CPU & Memory
-            cpu = psutil.cpu_percent(interval=None)
-            mem = psutil.virtual_memory()
-            swap = psutil.swap_memory()
-            # GPU
-            gpu_percent, gpu_temp_val, vram_tuple = safe_nvml_get()
-            vram_pct = 0.0
-            if vram_tuple:
-                used_v, total_v = vram_tuple
-                vram_pct = (used_v/total_v)*100 if total_v else 0
-            # Temps
-            cpu_temp_val = None
-            temps_func = getattr(psutil, 'sensors_temperatures', None)
-            if callable(temps_func):
-                try:
-                    temps_raw = temps_func()
-                    if isinstance(temps_raw, dict):
-                        # Find first with any reading
-                        for sensor_list in temps_raw.values():
-                            if sensor_list:
-                                cand = getattr(sensor_list[0], 'current', None)
-                                if cand is not None:
-                                    cpu_temp_val = cand
-                                    break
-                except Exception:
-                    cpu_temp_val = None
-            # Network
-            net_now = psutil.net_io_counters()
-            now = time.time()
-            dt = max(0.001, now - self.prev_time)
-            down_rate_bytes = (net_now.bytes_recv - self.prev_net.bytes_recv)/dt
-            up_rate_bytes = (net_now.bytes_sent - self.prev_net.bytes_sent)/dt
-            self.prev_net = net_now
-            # Disk IO
-            disk_io_now = psutil.disk_io_counters(perdisk=True)
-            reads = writes = 0.0
-            for name, stats in disk_io_now.items():
-                prev = self.prev_disk_io.get(name)
-                if prev:
-                    reads += max(0, stats.read_bytes - prev.read_bytes)
-                    writes += max(0, stats.write_bytes - prev.write_bytes)
-            reads_rate = reads/dt
-            writes_rate = writes/dt
-            self.prev_disk_io = disk_io_now
-            self.prev_time = now
-            # All disks (no limit)
-            self._update_disk_usage()
-            self.disk_io_var.set(f"IO: R {format_bytes(self.ema('read_rate', reads_rate))}/s  W {format_bytes(self.ema('write_rate', writes_rate))}/s")
-            # Smoothing main gauges
-            cpu_s = self.ema('cpu', cpu)
-            ram_s = self.ema('ram', mem.percent)
-            gpu_s = self.ema('gpu', gpu_percent)
-            vram_s = self.ema('vram', vram_pct)
-            # Colors
-            cpu_col = interpolate_color(CPU_COLOR, RAM_COLOR, DANGER_COLOR, cpu_s/100)
-            ram_col = interpolate_color(CPU_COLOR, RAM_COLOR, DANGER_COLOR, ram_s/100)
-            gpu_col = interpolate_color(CPU_COLOR, RAM_COLOR, DANGER_COLOR, gpu_s/100)
-            vram_col = interpolate_color(VRAM_COLOR, RAM_COLOR, DANGER_COLOR, vram_s/100)
-            self.gauge_cpu.set_value(cpu_s, color=cpu_col)
-            self.gauge_ram.set_value(ram_s, color=ram_col)
-            self.gauge_gpu.set_value(gpu_s, color=gpu_col)
-            self.gauge_vram.set_value(vram_s, color=vram_col)
-            # Detail texts
-            self.mem_detail_var.set(
-                f"RAM: {format_bytes(mem.used)} / {format_bytes(mem.total)} (Avail {format_bytes(mem.available)})\n" +
-                (f"Swap: {swap.percent:.0f}% ({format_bytes(swap.used)}/{format_bytes(swap.total)})" if swap.total else "Swap: –")
-            )
-            if vram_tuple:
-                used, total = vram_tuple
-                self.gpu_detail_var.set(f"VRAM: {format_bytes(used)} / {format_bytes(total)}\nUtil: {gpu_percent:.0f}%")
-            else:
-                self.gpu_detail_var.set("No GPU data")
-            self.cpu_temp_var.set(f"CPU Temp: {cpu_temp_val:.0f}°C" if cpu_temp_val is not None else 'CPU Temp: –')
-            self.gpu_temp_var.set(f"GPU Temp: {gpu_temp_val:.0f}°C" if gpu_temp_val is not None else 'GPU Temp: –')
-            # Network Mbps (decimal megabits)
-            down_mbps = self.ema('down', down_rate_bytes) * 8 / 1_000_000
-            up_mbps = self.ema('up', up_rate_bytes) * 8 / 1_000_000
-            self.net_down_var.set(f"↓ {down_mbps:.2f} Mb/s")
-            self.net_up_var.set(f"↑ {up_mbps:.2f} Mb/s")
-            self.uptime_var.set(f"Uptime: {format_time(time.time() - psutil.boot_time())}")
-            # Processes summary updated every 5 cycles
-            if self.update_counter % 5 == 0:
-                try:
-                    proc_count = len(psutil.pids())
-                    thread_total = 0
-                    for p in psutil.process_iter(['num_threads']):
-                        try:
-                            thread_total += p.info.get('num_threads', 0)
-                        except Exception:
-                            pass
-                    # Shorter text to avoid truncation
-                    self.proc_summary_var.set(f"Proc: {proc_count} Thr: {thread_total}")
-                except Exception:
-                    pass
-            # Battery
-            try:
-                bat = getattr(psutil, 'sensors_battery', lambda: None)()
-                if bat:
-                    plug = '⚡' if getattr(bat, 'power_plugged', False) else ''
-                    secs = getattr(bat, 'secsleft', None)
-                    left = ''
-                    if secs and secs > 0 and not getattr(bat, 'power_plugged', False):
-                        left = f" ({format_time(secs)})"
-                    self.battery_var.set(f"Battery: {bat.percent:.0f}%{plug}{left}")
-                else:
-                    self.battery_var.set("Battery: –")
-            except Exception:
-                self.battery_var.set("Battery: –")
+            snap = self.collectors.poll()
+            if self.shared_metrics is None and time.monotonic() >= self._shared_metrics_retry_at:
+                self._start_shared_metrics()
+            if self.shared_metrics is not None:
+                self.shared_metrics.publish(snap.values, snap.timestamp)
+            self._render(snap)
             now_str = time.strftime('%H:%M:%S')
             self.last_update_var.set(f"Updated {now_str}")
-            self.status_var.set('Monitoring')
+            if snap.partial:
+                self.status_var.set(f"Partial: {', '.join(sorted(snap.failed))} failing")
+            else:
+                self.status_var.set('Monitoring')
             self.update_fail_count = 0
         except Exception as e:
             self.update_fail_count += 1
@@ -477,20 +377,121 @@ class ResourceMonitorApp:
         finally:
             self.root.after(UPDATE_MS, self.update_stats)
 
-    def _update_disk_usage(self):
+    def _start_shared_metrics(self):
+        """Create the shared-memory writer; on failure (segment still held elsewhere) retry later."""
+        try:
+            self.shared_metrics = SharedMetricsWriter(self.collectors.shared_fields)
+        except Exception as e:
+            if str(e) != self._shared_metrics_error:  # Report each distinct reason once
+                print(f"Shared metrics disabled: {e}")
+            self._shared_metrics_error = str(e)
+            self._shared_metrics_retry_at = time.monotonic() + SHARED_METRICS_RETRY_S
+
+    def _render(self, snap: Snapshot):
+        """Update widgets from a (possibly partial) snapshot; missing fields render as '–'."""
+        # CPU & Memory
+        cpu = snap.get('cpu_percent')
+        mem_percent = snap.get('mem_percent')
+        # GPU
+        gpu_percent = snap.get('gpu_util')
+        vram_used, vram_total = snap.get('vram_used'), snap.get('vram_total')
+        vram_pct = (vram_used/vram_total)*100 if vram_used is not None and vram_total else None
+        # Disks
+        disks = snap.get('disks')
+        if disks is not None:
+            self._update_disk_usage(disks)
+        reads_rate, writes_rate = snap.get('disk_read_bps'), snap.get('disk_write_bps')
+        if reads_rate is not None and writes_rate is not None:
+            self.disk_io_var.set(f"IO: R {format_bytes(self.ema('read_rate', reads_rate))}/s  W {format_bytes(self.ema('write_rate', writes_rate))}/s")
+        else:
+            self.disk_io_var.set('IO: –')
+        # cgroup mode: CPU/RAM gauges show usage relative to the first group's limits when known
+        cg_cpu, cg_mem = snap.get('cg0_cpu_percent'), snap.get('cg0_mem_percent')
+        cpu_key, cpu_val = ('cg_cpu', cg_cpu) if cg_cpu is not None else ('cpu', cpu)
+        ram_key, ram_val = ('cg_ram', cg_mem) if cg_mem is not None else ('ram', mem_percent)
+        self.gauge_cpu.label_var.set('CPU (cgroup)' if cg_cpu is not None else 'CPU')
+        self.gauge_ram.label_var.set('RAM (cgroup)' if cg_mem is not None else 'RAM')
+        # Smoothing main gauges + colors
+        if cpu_val is not None:
+            cpu_s = self.ema(cpu_key, cpu_val)
+            self.gauge_cpu.set_value(cpu_s, color=interpolate_color(CPU_COLOR, RAM_COLOR, DANGER_COLOR, cpu_s/100))
+        if ram_val is not None:
+            ram_s = self.ema(ram_key, ram_val)
+            self.gauge_ram.set_value(ram_s, color=interpolate_color(CPU_COLOR, RAM_COLOR, DANGER_COLOR, ram_s/100))
+        gpu_s = self.ema('gpu', gpu_percent) if gpu_percent is not None else 0.0
+        self.gauge_gpu.set_value(gpu_s, color=interpolate_color(CPU_COLOR, RAM_COLOR, DANGER_COLOR, gpu_s/100))
+        vram_s = self.ema('vram', vram_pct) if vram_pct is not None else 0.0
+        self.gauge_vram.set_value(vram_s, color=interpolate_color(VRAM_COLOR, RAM_COLOR, DANGER_COLOR, vram_s/100))
+        # Detail texts
+        if mem_percent is not None:
+            swap_total = snap.get('swap_total', 0)
+            self.mem_detail_var.set(
+                f"RAM: {format_bytes(snap.get('mem_used'))} / {format_bytes(snap.get('mem_total'))} (Avail {format_bytes(snap.get('mem_available'))})\n" +
+                (f"Swap: {snap.get('swap_percent'):.0f}% ({format_bytes(snap.get('swap_used'))}/{format_bytes(swap_total)})" if swap_total else "Swap: –")
+            )
+        else:
+            self.mem_detail_var.set('RAM: –')
+        if vram_pct is not None:
+            self.gpu_detail_var.set(f"VRAM: {format_bytes(vram_used)} / {format_bytes(vram_total)}\nUtil: {gpu_percent or 0:.0f}%")
+        else:
+            self.gpu_detail_var.set("No GPU data")
+        if self.cgroup_collectors:
+            self.cgroup_detail_var.set(self._cgroup_text(snap, cpu))
+        cpu_temp_val = snap.get('cpu_temp')
+        gpu_temp_val = snap.get('gpu_temp')
+        self.cpu_temp_var.set(f"CPU Temp: {cpu_temp_val:.0f}°C" if cpu_temp_val is not None else 'CPU Temp: –')
+        self.gpu_temp_var.set(f"GPU Temp: {gpu_temp_val:.0f}°C" if gpu_temp_val is not None else 'GPU Temp: –')
+        # Network Mbps (decimal megabits)
+        down_rate_bytes, up_rate_bytes = snap.get('net_down_bps'), snap.get('net_up_bps')
+        if down_rate_bytes is not None and up_rate_bytes is not None:
+            down_mbps = self.ema('down', down_rate_bytes) * 8 / 1_000_000
+            up_mbps = self.ema('up', up_rate_bytes) * 8 / 1_000_000
+            self.net_down_var.set(f"↓ {down_mbps:.2f} Mb/s")
+            self.net_up_var.set(f"↑ {up_mbps:.2f} Mb/s")
+        boot_time = snap.get('boot_time')
+        self.uptime_var.set(f"Uptime: {format_time(time.time() - boot_time)}" if boot_time else 'Uptime: –')
+        # Processes summary (collector runs every 5s); shorter text to avoid truncation
+        proc_count = snap.get('proc_count')
+        if proc_count is not None:
+            self.proc_summary_var.set(f"Proc: {proc_count} Thr: {snap.get('thread_count', 0)}")
+        # Battery
+        bat_percent = snap.get('battery_percent')
+        if bat_percent is not None:
+            plugged = snap.get('battery_plugged', False)
+            plug = '⚡' if plugged else ''
+            secs = snap.get('battery_secsleft')
+            left = ''
+            if secs and secs > 0 and not plugged:
+                left = f" ({format_time(secs)})"
+            self.battery_var.set(f"Battery: {bat_percent:.0f}%{plug}{left}")
+        else:
+            self.battery_var.set("Battery: –")
+        # Plugin fields
+        if self.plugin_collectors:
+            parts = [f"{f}: {format_value(snap.get(f))}" for c in self.plugin_collectors for f in c.fields
+                     if snap.get(f) is not None]
+            text = '  '.join(parts) if parts else 'Plugins: –'
+            self.plugin_var.set(text if len(text) <= PLUGIN_TEXT_MAX else text[:PLUGIN_TEXT_MAX - 1] + '…')
+
+    def _cgroup_text(self, snap: Snapshot, host_cpu: Optional[float]) -> str:
+        mem_current = snap.get('cg0_mem_current')
+        if mem_current is None and snap.get('cg0_cpu_limit') is None:
+            return 'Cgroup: –'
+        mem_max = snap.get('cg0_mem_max')
+        mem = format_bytes(mem_current) if mem_current is not None else '–'
+        limit = format_bytes(mem_max) if mem_max is not None else 'no limit'
+        throttled = snap.get('cg0_throttled_percent')
+        line1 = f"Cgroup: {mem} / {limit}" + (f"  Thr {throttled:.0f}%" if throttled is not None else '')
+        # PSI avg10: % of time tasks stalled on cpu / memory / io
+        psi = [f"{tag} {snap.get(key):.0f}%" for tag, key in (('c', 'cg0_psi_cpu'), ('m', 'cg0_psi_mem'), ('io', 'cg0_psi_io'))
+               if snap.get(key) is not None]
+        line2 = ('PSI ' + ' '.join(psi) + '  ' if psi else '') + (f"Host CPU {host_cpu:.0f}%" if host_cpu is not None else '')
+        return line1 + ('\n' + line2 if line2 else '')
+
+    def _update_disk_usage(self, disks: List[Tuple[str, float, int, int]]):
         existing = set(self.disk_usage_rows.keys())
-        parts = [p for p in psutil.disk_partitions(all=False) if p.fstype and ('cdrom' not in p.opts.lower())]
         seen = set()
-        for p in parts:
-            letter = (p.device or p.mountpoint)
-            if os.name == 'nt' and len(letter) >= 2 and letter[1] == ':':
-                display = letter[:2]
-            else:
-                display = p.mountpoint
-            try:
-                usage = psutil.disk_usage(p.mountpoint)
-            except Exception:
-                continue
+        for display, percent, used, total in disks:
             seen.add(display)
             if display not in self.disk_usage_rows:
                 row = tk.Frame(self.disk_usage_frame, bg=CARD_BG)
@@ -507,9 +508,9 @@ class ResourceMonitorApp:
                 size_lbl.pack(anchor='e')
                 self.disk_usage_rows[display] = (bar, pct_lbl, size_lbl)
             bar, pct_lbl, size_lbl = self.disk_usage_rows[display]  # type: ignore[index]
-            bar['value'] = usage.percent
-            pct_lbl.configure(text=f"{usage.percent:.0f}%")
-            size_lbl.configure(text=f"{format_bytes(usage.used)}/{format_bytes(usage.total)}")
+            bar['value'] = percent
+            pct_lbl.configure(text=f"{percent:.0f}%")
+            size_lbl.configure(text=f"{format_bytes(used)}/{format_bytes(total)}")
         for k in list(existing - seen):
             widgets = self.disk_usage_rows.pop(k, None)
             if widgets:
@@ -0,0 +1,312 @@
+"""Shared-memory publication of Monix snapshots.
+
+Monix writes every snapshot into a fixed-layout ``multiprocessing.shared_memory``
+segment so other local processes can read the current values without polling
+psutil/NVML themselves. The module has no third-party dependencies; consumers only
+need this file to use ``SharedMetricsReader``.
+
+Segment layout (little-endian)::
+
+    header   40 bytes   magic b"MONX", layout version, header size, field count,
+                        schema entry size, writer pid (u32), seqlock counter (u64),
+                        snapshot timestamp (f64, seconds since epoch), flags (u32),
+                        generation (u32)
+    schema   field_count * entry size
+                        field name (32 bytes, UTF-8, NUL padded), type code (u8), pad
+    values   field_count * 8 bytes, in schema order
+
+Readers must locate the schema and values with the header and entry sizes stored in
+the header rather than the constants below, and look fields up by name, so later
+versions can grow the header or schema entries without breaking them. All values are
+currently float64 (type code ``TYPE_F64``); a missing reading is NaN.
+
+The seqlock counter is odd while the writer is updating the values. A reader copies
+the values between two reads of the counter and retries if it was odd or changed.
+
+The writer sets ``FLAG_CLOSED`` when Monix quits; readers then raise
+``SharedMetricsError`` and must ``close()`` and attach a new reader once Monix runs
+again. If Monix crashed instead, the flag is never set: check
+``SharedMetricsReader.alive`` (writer pid still running) or the snapshot timestamp.
+
+Only one writer owns a segment name at a time; a second Monix leaves a live segment
+alone and reclaims it only if its writer has exited. Where a name cannot be unlinked
+while handles are open (Windows keeps a mapping alive as long as a reader holds it),
+the new writer reinitialises the existing mapping in place and bumps the generation;
+readers attached to the previous generation raise ``SharedMetricsError`` as well.
+"""
+import math
+import os
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# POSIX names can be unlinked while readers still map them; Windows names cannot
+_CAN_UNLINK = sys.platform != 'win32'
+
+DEFAULT_NAME = "monix_metrics"
+MAGIC = b"MONX"
+LAYOUT_VERSION = 1
+TYPE_F64 = 1
+
+FLAG_CLOSED = 0x1
+
+HEADER = struct.Struct("<4sHHHHIQdII")
+SCHEMA_ENTRY = struct.Struct("<32sB7x")
+VALUE = struct.Struct("<d")
+PID_OFFSET = 12
+PID = struct.Struct("<I")
+SEQ_OFFSET = 16  # offset of the seqlock counter inside the header
+SEQ = struct.Struct("<Q")
+TIMESTAMP = struct.Struct("<d")
+TIMESTAMP_OFFSET = 24
+FLAGS_OFFSET = 32
+FLAGS = struct.Struct("<I")
+GENERATION_OFFSET = 36
+GENERATION = struct.Struct("<I")
+NAME_LEN = 32
+
+
+class SharedMetricsError(Exception):
+    """Raised when a segment is missing, foreign or cannot be read consistently."""
+
+
+def _segment_size(field_count: int) -> int:
+    return HEADER.size + field_count * (SCHEMA_ENTRY.size + VALUE.size)
+
+
+class SharedMetricsWriter:
+    """Owns the segment and publishes snapshots into it.
+
+    The schema is fixed when the writer is created; values for unknown names are
+    ignored and fields absent from a snapshot are published as NaN. Field names longer
+    than 32 bytes are skipped with a message.
+
+    Raises ``FileExistsError`` when another live Monix already publishes under ``name``.
+    """
+
+    def __init__(self, fields: Iterable[str], name: str = DEFAULT_NAME):
+        kept = []
+        for f in dict.fromkeys(fields):
+            if len(f.encode('utf-8')) > NAME_LEN:
+                print(f"Shared metrics: skipping field {f!r}, name longer than {NAME_LEN} bytes")
+            else:
+                kept.append(f)
+        self.fields: Tuple[str, ...] = tuple(kept)
+        size = _segment_size(len(self.fields))
+        generation = 0
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            reused = _reclaim_stale(name, size)
+            if reused is None:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            else:
+                self._shm, generation = reused
+                # Keep readers of the old generation out while the schema is rewritten
+                FLAGS.pack_into(self._shm.buf, FLAGS_OFFSET, FLAG_CLOSED)
+        self.name = self._shm.name
+        self._buf = self._shm.buf
+        self._values_offset = HEADER.size + len(self.fields) * SCHEMA_ENTRY.size
+        self._seq = 0
+        for i, f in enumerate(self.fields):
+            SCHEMA_ENTRY.pack_into(self._buf, HEADER.size + i * SCHEMA_ENTRY.size, f.encode('utf-8'), TYPE_F64)
+        for i in range(len(self.fields)):
+            VALUE.pack_into(self._buf, self._values_offset + i * VALUE.size, math.nan)
+        # Header last, so a reader never sees the magic before the schema is in place
+        HEADER.pack_into(self._buf, 0, MAGIC, LAYOUT_VERSION, HEADER.size, len(self.fields),
+                         SCHEMA_ENTRY.size, os.getpid(), self._seq, 0.0, 0, generation)
+
+    def publish(self, values: Dict[str, Any], timestamp: Optional[float] = None) -> None:
+        buf = self._buf
+        self._seq += 1  # odd: write in progress
+        SEQ.pack_into(buf, SEQ_OFFSET, self._seq)
+        for i, f in enumerate(self.fields):
+            v = values.get(f)
+            if isinstance(v, (int, float)):  # bool is an int
+                v = float(v)
+            else:
+                v = math.nan
+            VALUE.pack_into(buf, self._values_offset + i * VALUE.size, v)
+        TIMESTAMP.pack_into(buf, TIMESTAMP_OFFSET, time.time() if timestamp is None else timestamp)
+        self._seq += 1  # even: consistent
+        SEQ.pack_into(buf, SEQ_OFFSET, self._seq)
+
+    def close(self) -> None:
+        FLAGS.pack_into(self._buf, FLAGS_OFFSET, FLAG_CLOSED)
+        self._buf = None  # type: ignore[assignment]
+        owned = self._owns_name()
+        self._shm.close()
+        if owned:
+            self._shm.unlink()
+        elif sys.platform != 'win32':
+            # The name now belongs to someone else (or is gone); make sure this
+            # process's resource tracker does not unlink it at exit.
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self._shm._name, 'shared_memory')  # type: ignore[attr-defined]
+
+    def _owns_name(self) -> bool:
+        """True if the segment currently published under our name is the one we created."""
+        try:
+            # Plain attach: the tracker already holds our registration for this name, and
+            # _attach's unregister would cancel it. If the name is someone else's, close()
+            # unregisters it below.
+            current = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False
+        try:
+            header = bytes(current.buf[:HEADER.size])
+        finally:
+            current.close()
+        return header[:4] == MAGIC and PID.unpack_from(header, PID_OFFSET)[0] == os.getpid()
+
+
+class SharedMetricsReader:
+    """Attach to a Monix segment and read values without syscalls.
+
+    >>> reader = SharedMetricsReader()
+    >>> reader.get('cpu_percent')
+    12.5
+    >>> ts, values = reader.read()
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        try:
+            self._shm = _attach(name)
+        except FileNotFoundError:
+            raise SharedMetricsError(f"No Monix segment named {name!r}; is Monix running?")
+        self._buf = self._shm.buf
+        magic, version, header_size, count, entry_size, self.pid, _, _, _, self.generation = \
+            HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            self.close()
+            raise SharedMetricsError(f"Segment {name!r} is not a Monix metrics segment")
+        self.version = version
+        self._values_offset = header_size + count * entry_size
+        self._index: Dict[str, int] = {}
+        for i in range(count):
+            raw_name, type_code = SCHEMA_ENTRY.unpack_from(self._buf, header_size + i * entry_size)
+            if type_code == TYPE_F64:  # skip value types this reader does not understand
+                self._index[raw_name.rstrip(b"\0").decode('utf-8')] = i
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._index)
+
+    @property
+    def closed(self) -> bool:
+        """True once the writer this reader attached to has stopped publishing."""
+        buf = self._buf
+        return bool(FLAGS.unpack_from(buf, FLAGS_OFFSET)[0] & FLAG_CLOSED) \
+            or GENERATION.unpack_from(buf, GENERATION_OFFSET)[0] != self.generation
+
+    @property
+    def alive(self) -> bool:
+        """True while the writer is still publishing (also detects a crashed writer)."""
+        return not self.closed and _pid_alive(self.pid)
+
+    def _consistent(self, fn, retries: int):
+        buf = self._buf
+        if self.closed:
+            raise SharedMetricsError("Monix has stopped publishing; close() and reattach once it is running again")
+        for _ in range(retries):
+            before = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+            if before & 1:
+                continue
+            result = fn(buf)
+            if SEQ.unpack_from(buf, SEQ_OFFSET)[0] == before:
+                return result
+        raise SharedMetricsError("Could not get a consistent read; writer too busy")
+
+    def read(self, retries: int = 1000) -> Tuple[float, Dict[str, float]]:
+        """Return (timestamp, {field: value}) from one consistent snapshot."""
+        offset = self._values_offset
+
+        def copy(buf):
+            ts = TIMESTAMP.unpack_from(buf, TIMESTAMP_OFFSET)[0]
+            return ts, {f: VALUE.unpack_from(buf, offset + i * VALUE.size)[0] for f, i in self._index.items()}
+        return self._consistent(copy, retries)
+
+    def get(self, field: str, retries: int = 1000) -> float:
+        """Return a single value (NaN when Monix has no reading for it)."""
+        pos = self._values_offset + self._index[field] * VALUE.size
+        return self._consistent(lambda buf: VALUE.unpack_from(buf, pos)[0], retries)
+
+    def close(self) -> None:
+        self._buf = None  # type: ignore[assignment]
+        self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if sys.platform == 'win32':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+        handle = kernel32.OpenProcess(0x00100000, False, pid)  # SYNCHRONIZE
+        if not handle:
+            return False
+        try:
+            return kernel32.WaitForSingleObject(handle, 0) == 0x102  # WAIT_TIMEOUT: still running
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _reclaim_stale(name: str, size: int) -> Optional[Tuple[shared_memory.SharedMemory, int]]:
+    """Take over an existing segment left behind by a writer that is no longer running.
+
+    Where possible the old name is unlinked and None is returned, so the caller creates
+    a fresh segment. Otherwise the existing mapping is returned for reuse in place,
+    together with the next generation number. Raises ``FileExistsError`` if the segment
+    is foreign, its writer is still alive, or it is too small to reuse.
+    """
+    existing = _attach(name)
+    try:
+        header = bytes(existing.buf[:HEADER.size]) if existing.size >= HEADER.size else b""
+    finally:
+        existing.close()
+    if header[:4] != MAGIC:
+        raise FileExistsError(f"Shared memory {name!r} exists and is not a Monix segment")
+    pid = PID.unpack_from(header, PID_OFFSET)[0]
+    closed = FLAGS.unpack_from(header, FLAGS_OFFSET)[0] & FLAG_CLOSED
+    if not closed and _pid_alive(pid):
+        raise FileExistsError(f"Shared metrics {name!r} already published by Monix pid {pid}")
+    if not _CAN_UNLINK:
+        # A reader still holds the old mapping open; reuse it if our schema fits
+        reused = shared_memory.SharedMemory(name=name)
+        if reused.size < size:
+            reused.close()
+            raise FileExistsError(f"Shared metrics {name!r} is held open by a reader and too small to reuse")
+        generation = GENERATION.unpack_from(header, GENERATION_OFFSET)[0]
+        return reused, (generation + 1) & 0xFFFFFFFF
+    if sys.version_info < (3, 13):
+        # _attach unregistered the name; register it again so unlink() pairs up
+        from multiprocessing import resource_tracker
+        resource_tracker.register(existing._name, 'shared_memory')  # type: ignore[attr-defined]
+    existing.unlink()
+    return None
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing segment without letting this process's resource tracker unlink it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    shm = shared_memory.SharedMemory(name=name)
+    if sys.platform != 'win32':
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')  # type: ignore[attr-defined]
+    return shm
@@ -0,0 +1,97 @@
+import shutil
+
+import pytest
+
+from collectors import (CgroupCollector, CollectorUnavailable, _count_cpu_list,
+                        _parse_pressure)
+
+PRESSURE = ("some avg10=1.50 avg60=0.20 avg300=0.00 total=100\n"
+            "full avg10=0.70 avg60=0.10 avg300=0.00 total=50\n")
+
+
+def write(path, name, text):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / name).write_text(text)
+
+
+def test_parse_pressure():
+    assert _parse_pressure(PRESSURE) == {"some": 1.5, "full": 0.7}
+    assert _parse_pressure("some avg10=3.00 avg60=0 avg300=0 total=1\n") == {"some": 3.0}
+
+
+def test_count_cpu_list():
+    assert _count_cpu_list("0") == 1
+    assert _count_cpu_list("0-3,8,10-11") == 7
+
+
+def test_namespace_root_limits(tmp_path):
+    # Container with its own cgroup namespace: "self" is "/" and limits sit at the mount root
+    write(tmp_path, "memory.max", str(1 << 30))
+    write(tmp_path, "memory.current", str(1 << 28))
+    write(tmp_path, "cpu.max", "50000 100000")
+    write(tmp_path, "cpu.pressure", PRESSURE)
+    values = CgroupCollector("/", mount=str(tmp_path)).collect()
+    assert values["cg0_mem_max"] == 1 << 30
+    assert values["cg0_mem_percent"] == pytest.approx(25.0)
+    assert values["cg0_cpu_limit"] == pytest.approx(0.5)
+    assert values["cg0_psi_cpu"] == 1.5
+    assert values["cg0_psi_cpu_full"] == 0.7
+
+
+def test_ancestor_limits_apply_to_leaf(tmp_path):
+    slice_dir = tmp_path / "jobs.slice"
+    leaf = slice_dir / "job.scope"
+    write(slice_dir, "memory.max", str(4 << 30))
+    write(slice_dir, "cpu.max", "150000 100000")
+    write(leaf, "memory.max", "max")
+    write(leaf, "cpu.max", "max 100000")
+    write(leaf, "cpuset.cpus.effective", "0-3")
+    write(leaf, "memory.current", str(1 << 30))
+    write(leaf, "cpu.stat", "usage_usec 1000\n")  # cpu controller off: no throttling keys
+    c = CgroupCollector("/jobs.slice/job.scope", index=1, mount=str(tmp_path))
+    c.collect()
+    values = c.collect()
+    assert values["cg1_mem_max"] == 4 << 30
+    assert values["cg1_mem_percent"] == pytest.approx(25.0)
+    assert values["cg1_cpu_limit"] == pytest.approx(1.5)
+    assert "cg1_cpu_percent" in values
+    assert "cg1_throttled_percent" not in values
+
+
+def test_throttling_reported_with_cpu_controller(tmp_path):
+    write(tmp_path / "g", "cpu.stat", "usage_usec 0\nnr_periods 100\nnr_throttled 10\n")
+    c = CgroupCollector("/g", mount=str(tmp_path))
+    c.collect()
+    (tmp_path / "g" / "cpu.stat").write_text("usage_usec 0\nnr_periods 200\nnr_throttled 30\n")
+    assert c.collect()["cg0_throttled_percent"] == pytest.approx(20.0)
+
+
+class _RemovedFile:
+    """Stands in for a cgroupfs handle whose group was deleted (reads fail with ENODEV)."""
+
+    def seek(self, pos):
+        raise OSError(19, "No such device")
+
+    def close(self):
+        pass
+
+
+def test_removed_group_is_reopened(tmp_path):
+    group = tmp_path / "svc.service"
+    write(group, "memory.current", "100")
+    c = CgroupCollector("/svc.service", mount=str(tmp_path))
+    assert c.collect()["cg0_mem_current"] == 100
+    c._files["memory.current"] = _RemovedFile()
+    with pytest.raises(OSError):
+        c.collect()
+    assert c._files is None and c._prev_cpu is None and c._prev_io is None
+    shutil.rmtree(group)
+    with pytest.raises(FileNotFoundError):  # reported as a failure, not disabled
+        c.collect()
+    write(group, "memory.current", "200")
+    assert c.collect()["cg0_mem_current"] == 200
+
+
+def test_missing_group_is_unavailable(tmp_path):
+    with pytest.raises(CollectorUnavailable):
+        CgroupCollector("/nope", mount=str(tmp_path)).collect()
@@ -0,0 +1,107 @@
+import math
+import uuid
+
+import pytest
+
+import sharedmetrics
+from sharedmetrics import (FLAG_CLOSED, FLAGS, FLAGS_OFFSET, SharedMetricsError,
+                           SharedMetricsReader, SharedMetricsWriter)
+
+
+@pytest.fixture
+def name():
+    return f"monix_test_{uuid.uuid4().hex[:8]}"
+
+
+def _abandon(writer):
+    """Simulate a writer that quit while a reader kept the mapping: flag closed, no unlink."""
+    FLAGS.pack_into(writer._buf, FLAGS_OFFSET, FLAG_CLOSED)
+    writer._buf = None
+    writer._shm.close()
+
+
+def test_round_trip(name):
+    writer = SharedMetricsWriter(["cpu_percent", "battery_plugged", "disks", "x" * 40], name=name)
+    try:
+        assert writer.fields == ("cpu_percent", "battery_plugged", "disks")  # over-long name skipped
+        writer.publish({"cpu_percent": 12.5, "battery_plugged": True, "disks": [("C:", 1, 2, 3)]}, timestamp=42.0)
+        with SharedMetricsReader(name) as reader:
+            assert reader.alive
+            assert reader.get("cpu_percent") == 12.5
+            ts, values = reader.read()
+            assert ts == 42.0
+            assert values["battery_plugged"] == 1.0
+            assert math.isnan(values["disks"])
+    finally:
+        writer.close()
+
+
+def test_closed_flag_and_unlink(name):
+    writer = SharedMetricsWriter(["cpu_percent"], name=name)
+    reader = SharedMetricsReader(name)
+    writer.close()
+    assert reader.closed and not reader.alive
+    with pytest.raises(SharedMetricsError):
+        reader.read()
+    reader.close()
+    with pytest.raises(SharedMetricsError):
+        SharedMetricsReader(name)
+
+
+def test_live_segment_is_not_taken_over(name):
+    first = SharedMetricsWriter(["cpu_percent"], name=name)
+    try:
+        with pytest.raises(FileExistsError):
+            SharedMetricsWriter(["cpu_percent"], name=name)
+        first.publish({"cpu_percent": 3.0})
+        with SharedMetricsReader(name) as reader:
+            assert reader.get("cpu_percent") == 3.0
+    finally:
+        first.close()
+
+
+def test_stale_segment_is_replaced(name):
+    old = SharedMetricsWriter(["a"], name=name)
+    old_reader = SharedMetricsReader(name)
+    _abandon(old)
+    new = SharedMetricsWriter(["a", "b"], name=name)
+    try:
+        new.publish({"a": 1.0, "b": 2.0})
+        with pytest.raises(SharedMetricsError):
+            old_reader.read()
+        old_reader.close()
+        with SharedMetricsReader(name) as reader:
+            assert reader.read()[1] == {"a": 1.0, "b": 2.0}
+    finally:
+        new.close()
+
+
+def test_stale_segment_reused_in_place_when_name_cannot_be_unlinked(name, monkeypatch):
+    monkeypatch.setattr(sharedmetrics, "_CAN_UNLINK", False)
+    old = SharedMetricsWriter(["a", "b"], name=name)
+    old_reader = SharedMetricsReader(name)
+    _abandon(old)
+    new = SharedMetricsWriter(["b"], name=name)
+    try:
+        new.publish({"b": 5.0})
+        assert old_reader.closed  # generation changed underneath it
+        with pytest.raises(SharedMetricsError):
+            old_reader.get("a")
+        old_reader.close()
+        with SharedMetricsReader(name) as reader:
+            assert reader.generation == 1
+            assert reader.fields == ["b"]
+            assert reader.get("b") == 5.0
+    finally:
+        new.close()
+
+
+def test_stale_segment_too_small_to_reuse(name, monkeypatch):
+    monkeypatch.setattr(sharedmetrics, "_CAN_UNLINK", False)
+    old = SharedMetricsWriter(["a"], name=name)
+    FLAGS.pack_into(old._buf, FLAGS_OFFSET, FLAG_CLOSED)
+    try:
+        with pytest.raises(FileExistsError):
+            SharedMetricsWriter(["a", "b", "c"], name=name)
+    finally:
+        old.close()